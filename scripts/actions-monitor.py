@@ -19,10 +19,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CHECKPOINT_VERSION = 2
+
+# An unfinished checkpoint is discarded (and a fresh scan started) once it is
+# older than this or has been resumed this many times without completing
+CHECKPOINT_MAX_AGE_HOURS = 24
+CHECKPOINT_MAX_ATTEMPTS = 4
+
+# A job whose analysis was interrupted this many times (e.g. its logs keep
+# stalling the step until it times out) is skipped on the next attempt
+MAX_JOB_ATTEMPTS = 2
+
+# Regex flags used when matching error-patterns.json against job logs
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+class RateLimitExceeded(Exception):
+    """Raised when the GitHub API rate limit is exhausted"""
+    def __init__(self, reset_at: Optional[str] = None):
+        self.reset_at = reset_at
+        super().__init__(f"GitHub API rate limit exceeded (resets at {reset_at or 'unknown'})")
+
 class GitHubActionsMonitor:
-    def __init__(self, repo: str, token: str):
+    def __init__(self, repo: str, token: str, checkpoint_file: Optional[str] = None):
         self.repo = repo
         self.token = token
+        self.checkpoint_file = checkpoint_file
         self.base_url = "https://api.github.com"
         self.headers = {
             "Authorization": f"token {token}",
@@ -42,53 +63,129 @@ class GitHubActionsMonitor:
             logger.warning(f"Error patterns file not found: {patterns_file}")
             return {}
     
-    def get_recent_workflow_runs(self, hours: int = 24) -> List[Dict]:
-        """Get workflow runs from the last N hours"""
-        since = (datetime.utcnow() - timedelta(hours=hours)).isoformat() + 'Z'
+    def load_checkpoint(self) -> Optional[Dict]:
+        """Load an unfinished checkpoint for this repo, if any"""
+        if not self.checkpoint_file:
+            return None
+        
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_file}: {e}")
+            return None
+        
+        if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('repo') != self.repo:
+            logger.warning(f"Ignoring checkpoint {self.checkpoint_file}: written for a different repo or version")
+            return None
+        
+        if checkpoint.get('complete'):
+            return None
+        
+        started_at = datetime.fromisoformat(checkpoint['started_at'])
+        if datetime.utcnow() - started_at > timedelta(hours=CHECKPOINT_MAX_AGE_HOURS):
+            logger.warning(f"Discarding checkpoint {self.checkpoint_file}: older than {CHECKPOINT_MAX_AGE_HOURS} hours")
+            return None
+        
+        if checkpoint['attempts'] >= CHECKPOINT_MAX_ATTEMPTS:
+            logger.warning(f"Discarding checkpoint {self.checkpoint_file}: not completed after {checkpoint['attempts']} attempts")
+            return None
+        
+        return checkpoint
+    
+    def save_checkpoint(self, checkpoint: Dict):
+        """Atomically flush scan progress to the checkpoint file"""
+        if not self.checkpoint_file:
+            return
+        
+        tmp_file = f"{self.checkpoint_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(checkpoint, f, indent=2)
+            os.replace(tmp_file, self.checkpoint_file)
+        except OSError as e:
+            logger.error(f"Failed to write checkpoint {self.checkpoint_file}: {e}")
+    
+    def _get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET an API URL, raising RateLimitExceeded when the quota is exhausted"""
+        response = requests.get(url, headers=self.headers, params=params)
+        
+        if response.status_code in (403, 429):
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if response.status_code == 429 or remaining == '0':
+                reset = response.headers.get('X-RateLimit-Reset')
+                reset_at = datetime.utcfromtimestamp(int(reset)).isoformat() + 'Z' if reset and reset.isdigit() else None
+                raise RateLimitExceeded(reset_at)
+        
+        response.raise_for_status()
+        return response
+    
+    def get_recent_workflow_runs(self, hours: int = 24, since: Optional[str] = None,
+                                 until: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        """Get workflow runs from the last N hours, or created between `since` and `until`.
+        
+        With strict=True fetch failures are raised instead of returning an empty list.
+        """
+        if since is None:
+            since = (datetime.utcnow() - timedelta(hours=hours)).isoformat() + 'Z'
         
         url = f"{self.base_url}/repos/{self.repo}/actions/runs"
         params = {
-            'per_page': 50,
-            'created': f'>={since}'
+            'per_page': 100,
+            'created': f'{since}..{until}' if until else f'>={since}'
         }
         
+        runs = []
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json().get('workflow_runs', [])
+            page = 1
+            while True:
+                response = self._get(url, params={**params, 'page': page})
+                page_runs = response.json().get('workflow_runs', [])
+                runs.extend(page_runs)
+                if len(page_runs) < params['per_page']:
+                    return runs
+                page += 1
         except requests.RequestException as e:
             logger.error(f"Failed to fetch workflow runs: {e}")
-            return []
+            if strict:
+                raise
+            return runs
     
-    def get_workflow_jobs(self, run_id: int) -> List[Dict]:
+    def get_workflow_jobs(self, run_id: int, strict: bool = False) -> List[Dict]:
         """Get jobs for a specific workflow run"""
         url = f"{self.base_url}/repos/{self.repo}/actions/runs/{run_id}/jobs"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            response = self._get(url, params={'per_page': 100})
             return response.json().get('jobs', [])
         except requests.RequestException as e:
             logger.error(f"Failed to fetch jobs for run {run_id}: {e}")
+            if strict:
+                raise
             return []
     
-    def get_job_logs(self, job_id: int) -> str:
+    def get_job_logs(self, job_id: int, strict: bool = False) -> str:
         """Get logs for a specific job"""
         url = f"{self.base_url}/repos/{self.repo}/actions/jobs/{job_id}/logs"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            response = self._get(url)
             return response.text
         except requests.RequestException as e:
             logger.error(f"Failed to fetch logs for job {job_id}: {e}")
+            # Expired or deleted logs will never come back, so they are not worth pausing for
+            gone = getattr(e, 'response', None) is not None and e.response.status_code in (404, 410)
+            if strict and not gone:
+                raise
             return ""
     
     def analyze_error(self, logs: str, workflow_name: str) -> Optional[Dict]:
         """Analyze error logs and suggest fixes"""
         for pattern_name, pattern_data in self.error_patterns.items():
             for error_pattern in pattern_data.get('patterns', []):
-                if re.search(error_pattern, logs, re.IGNORECASE | re.MULTILINE):
+                if re.search(error_pattern, logs, PATTERN_FLAGS):
                     return {
                         'error_type': pattern_name,
                         'description': pattern_data.get('description', ''),
@@ -115,60 +212,147 @@ class GitHubActionsMonitor:
         
         return None
     
-    def monitor_workflows(self) -> Dict:
-        """Monitor workflows and return analysis results"""
+    def monitor_workflows(self, hours: int = 24, resume: bool = False) -> Dict:
+        """Monitor workflows and return analysis results.
+        
+        Progress is flushed to the checkpoint file after every analysed job, so a
+        run that times out, hits the rate limit or fails to fetch from the API can
+        be continued with resume=True over the same time window.
+        """
         logger.info(f"Monitoring workflows for repo: {self.repo}")
         
-        runs = self.get_recent_workflow_runs()
-        results = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'total_runs': len(runs),
-            'failed_runs': 0,
-            'successful_runs': 0,
-            'errors_found': [],
-            'summary': {}
-        }
+        checkpoint = self.load_checkpoint() if resume else None
+        if checkpoint:
+            checkpoint['attempts'] += 1
+            logger.info(
+                f"Resuming from checkpoint {self.checkpoint_file} (attempt {checkpoint['attempts']}): "
+                f"{len(checkpoint['completed_runs'])} runs, {len(checkpoint['completed_jobs'])} jobs already analysed"
+            )
+            results = checkpoint['results']
+        else:
+            now = datetime.utcnow()
+            results = {
+                'timestamp': now.isoformat(),
+                'total_runs': 0,
+                'failed_runs': 0,
+                'successful_runs': 0,
+                'errors_found': [],
+                'skipped_jobs': [],
+                'summary': {}
+            }
+            checkpoint = {
+                'version': CHECKPOINT_VERSION,
+                'repo': self.repo,
+                'started_at': now.isoformat(),
+                'since': (now - timedelta(hours=hours)).isoformat() + 'Z',
+                'until': now.isoformat() + 'Z',
+                'attempts': 1,
+                'complete': False,
+                'completed_runs': [],
+                'completed_jobs': [],
+                'job_attempts': {},
+                'results': results
+            }
         
-        workflow_stats = {}
+        self.save_checkpoint(checkpoint)
         
-        for run in runs:
-            workflow_name = run.get('name', 'Unknown')
-            conclusion = run.get('conclusion')
-            
-            # Update stats
-            if workflow_name not in workflow_stats:
-                workflow_stats[workflow_name] = {'total': 0, 'failed': 0, 'success': 0}
-            
-            workflow_stats[workflow_name]['total'] += 1
+        workflow_stats = results['summary']
+        completed_runs = set(checkpoint['completed_runs'])
+        completed_jobs = set(checkpoint['completed_jobs'])
+        job_attempts = checkpoint['job_attempts']
+        current_job = None
+        
+        try:
+            runs = self.get_recent_workflow_runs(since=checkpoint['since'], until=checkpoint['until'], strict=True)
+            results['total_runs'] = len(runs)
             
-            if conclusion == 'failure':
-                results['failed_runs'] += 1
-                workflow_stats[workflow_name]['failed'] += 1
+            for run in runs:
+                if run['id'] in completed_runs:
+                    continue
                 
-                # Analyze failed run
-                logger.info(f"Analyzing failed run: {workflow_name} (ID: {run['id']})")
-                jobs = self.get_workflow_jobs(run['id'])
+                workflow_name = run.get('name', 'Unknown')
+                conclusion = run.get('conclusion')
                 
-                for job in jobs:
-                    if job.get('conclusion') == 'failure':
-                        logs = self.get_job_logs(job['id'])
-                        error_analysis = self.analyze_error(logs, workflow_name)
+                if conclusion == 'failure':
+                    # Analyze failed run
+                    logger.info(f"Analyzing failed run: {workflow_name} (ID: {run['id']})")
+                    jobs = self.get_workflow_jobs(run['id'], strict=True)
+                    
+                    for job in jobs:
+                        if job['id'] in completed_jobs or job.get('conclusion') != 'failure':
+                            continue
                         
-                        if error_analysis:
-                            error_analysis.update({
+                        # Record the attempt before fetching, so a job that kills the
+                        # step (e.g. by stalling until the timeout) is eventually skipped
+                        attempts = job_attempts.get(str(job['id']), 0)
+                        if attempts >= MAX_JOB_ATTEMPTS:
+                            logger.warning(f"Skipping job {job['id']}: analysis was interrupted {attempts} times")
+                            results['skipped_jobs'].append({
                                 'run_id': run['id'],
                                 'job_id': job['id'],
                                 'job_name': job.get('name', 'Unknown'),
-                                'run_url': run.get('html_url', ''),
-                                'created_at': run.get('created_at', '')
+                                'workflow_name': workflow_name,
+                                'run_url': run.get('html_url', '')
                             })
-                            results['errors_found'].append(error_analysis)
+                        else:
+                            job_attempts[str(job['id'])] = attempts + 1
+                            current_job = job['id']
+                            self.save_checkpoint(checkpoint)
+                            
+                            logs = self.get_job_logs(job['id'], strict=True)
+                            error_analysis = self.analyze_error(logs, workflow_name)
+                            
+                            if error_analysis:
+                                error_analysis.update({
+                                    'run_id': run['id'],
+                                    'job_id': job['id'],
+                                    'job_name': job.get('name', 'Unknown'),
+                                    'run_url': run.get('html_url', ''),
+                                    'created_at': run.get('created_at', '')
+                                })
+                                results['errors_found'].append(error_analysis)
+                        
+                        current_job = None
+                        completed_jobs.add(job['id'])
+                        checkpoint['completed_jobs'].append(job['id'])
+                        self.save_checkpoint(checkpoint)
+                
+                # Update stats only once the whole run is done, so a resumed
+                # run is never counted twice
+                if workflow_name not in workflow_stats:
+                    workflow_stats[workflow_name] = {'total': 0, 'failed': 0, 'success': 0}
+                
+                workflow_stats[workflow_name]['total'] += 1
+                
+                if conclusion == 'failure':
+                    results['failed_runs'] += 1
+                    workflow_stats[workflow_name]['failed'] += 1
+                elif conclusion == 'success':
+                    results['successful_runs'] += 1
+                    workflow_stats[workflow_name]['success'] += 1
+                
+                completed_runs.add(run['id'])
+                checkpoint['completed_runs'].append(run['id'])
+                self.save_checkpoint(checkpoint)
+        except (RateLimitExceeded, requests.RequestException) as e:
+            # Rate limits and dropped connections are not the job's fault, so refund the
+            # attempt. An error response for the job's logs counts against it, so a job
+            # whose logs keep failing ends up in skipped_jobs instead of blocking the scan.
+            transient = (RateLimitExceeded, requests.ConnectionError, requests.Timeout)
+            if current_job is not None and isinstance(e, transient):
+                job_attempts[str(current_job)] -= 1
             
-            elif conclusion == 'success':
-                results['successful_runs'] += 1
-                workflow_stats[workflow_name]['success'] += 1
+            logger.warning(f"{e}; pausing scan. Re-run with resume enabled to continue from the checkpoint.")
+            results['paused'] = True
+            results['pause_reason'] = 'rate_limit' if isinstance(e, RateLimitExceeded) else 'fetch_failed'
+            results['resume_after'] = getattr(e, 'reset_at', None)
+            self.save_checkpoint(checkpoint)
+            return results
         
-        results['summary'] = workflow_stats
+        for key in ('paused', 'pause_reason', 'resume_after'):
+            results.pop(key, None)
+        checkpoint['complete'] = True
+        self.save_checkpoint(checkpoint)
         return results
     
     def generate_report(self, results: Dict) -> str:
@@ -177,6 +361,16 @@ class GitHubActionsMonitor:
         report.append("# 🔍 GitHub Actions Monitoring Report")
         report.append(f"**Generated:** {results['timestamp']}")
         report.append(f"**Repository:** {self.repo}")
+        
+        if results.get('paused'):
+            if results.get('pause_reason') == 'rate_limit':
+                reason = f"GitHub API rate limit exhausted (resets at {results.get('resume_after') or 'unknown'})"
+            else:
+                reason = "GitHub API request failed"
+            report.append("")
+            report.append(f"> ⏸️ **Scan paused:** {reason}."
+                          " Results below are partial; the next resumed run continues from the checkpoint.")
+        
         report.append("")
         
         # Summary
@@ -199,6 +393,13 @@ class GitHubActionsMonitor:
                 status_emoji = "✅" if success_rate >= 80 else "⚠️" if success_rate >= 50 else "❌"
                 report.append(f"- **{status_emoji} {workflow}:** {stats['success']}/{stats['total']} ({success_rate:.1f}%)")
         
+        if results.get('skipped_jobs'):
+            report.append("")
+            report.append("## ⏭️ Skipped Jobs")
+            report.append("Analysis of these jobs was interrupted repeatedly, so they were skipped:")
+            for job in results['skipped_jobs']:
+                report.append(f"- **{job['workflow_name']}** / {job['job_name']}: {job['run_url']}")
+        
         # Errors found
         if results['errors_found']:
             report.append("")
@@ -220,8 +421,12 @@ class GitHubActionsMonitor:
                 report.append("")
         else:
             report.append("")
-            report.append("## 🎉 No Errors Found!")
-            report.append("All workflows are running successfully.")
+            if results.get('paused'):
+                report.append("## ⏸️ No Errors Found Yet")
+                report.append("The scan was paused before all runs were analysed.")
+            else:
+                report.append("## 🎉 No Errors Found!")
+                report.append("All workflows are running successfully.")
         
         return "\n".join(report)
 
@@ -234,8 +439,12 @@ def main():
         logger.error("GITHUB_TOKEN environment variable is required")
         return
     
-    monitor = GitHubActionsMonitor(repo, token)
-    results = monitor.monitor_workflows()
+    hours = int(os.getenv('MONITOR_HOURS') or 24)
+    checkpoint_file = os.getenv('MONITOR_CHECKPOINT_FILE', 'workflow-monitor-checkpoint.json')
+    resume = os.getenv('MONITOR_RESUME', 'false').lower() == 'true'
+    
+    monitor = GitHubActionsMonitor(repo, token, checkpoint_file=checkpoint_file)
+    results = monitor.monitor_workflows(hours=hours, resume=resume)
     report = monitor.generate_report(results)
     
     # Print report
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Error Pattern Profiler
+Replays a local corpus of saved job logs through the GitHubActionsMonitor matcher
+and reports the cost, hit rate and overlap of every pattern in error-patterns.json.
+"""
+
+import os
+import sys
+import json
+import math
+import re
+import time
+import argparse
+import copy
+import functools
+import importlib.util
+import multiprocessing
+from typing import Callable, Dict, List, Tuple
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Input lengths (in characters) used when probing patterns for backtracking.
+# The probe starts small and stops growing once PROBE_BUDGET is spent.
+ADVERSARIAL_SIZES = [64 * 2 ** i for i in range(13)]
+
+# Wall-clock seconds one probe may spend on a pattern/input shape
+PROBE_BUDGET = 1.0
+
+# Hard limit for a single probe search; a pattern exceeding it is catastrophic
+PROBE_SEARCH_TIMEOUT = 2.0
+
+# Hard limit for matching one pattern against one corpus log
+CORPUS_SEARCH_TIMEOUT = 10.0
+
+# The exponent is fitted over the largest sizes measured, and needs at least this many
+MIN_FIT_POINTS = 4
+
+# Fitted growth exponent above which a pattern is considered super-linear, and the
+# exponent every consecutive pair of sizes must also exceed for the growth to count
+SUPERLINEAR_EXPONENT = 1.5
+CONSISTENT_EXPONENT = 1.2
+
+# Fitted growth exponent treated as runaway (exponential-looking) backtracking
+CATASTROPHIC_EXPONENT = 3.0
+
+# Line length used to check whether super-linear growth is confined to a single line
+LINE_LENGTH = 120
+
+# Backtracking severities, from least to most severe
+SEVERITIES = ['linear', 'line_bounded', 'superlinear', 'catastrophic']
+
+REGEX_METACHARS = set('.^$*+?{}[]|()')
+REGEX_QUANTIFIERS = set('*+?{')
+
+def load_monitor_module():
+    """Import actions-monitor.py, whose file name is not a valid module name"""
+    module_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'actions-monitor.py')
+    spec = importlib.util.spec_from_file_location('actions_monitor', module_path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle objects defined in it
+    sys.modules['actions_monitor'] = module
+    spec.loader.exec_module(module)
+    return module
+
+actions_monitor = load_monitor_module()
+
+def literal_prefix(pattern: str) -> str:
+    """Return the literal text a pattern starts with, e.g. 'timeout' for 'timeout.*exceeded'"""
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            char = pattern[i + 1]
+            i += 2
+        elif char in REGEX_METACHARS:
+            break
+        else:
+            i += 1
+
+        # A quantified character is not guaranteed to appear
+        if i < len(pattern) and pattern[i] in REGEX_QUANTIFIERS:
+            break
+        prefix.append(char)
+
+    return ''.join(prefix)
+
+def time_search(regex: re.Pattern, text: str, repeat: int = 3) -> Tuple[float, bool]:
+    """Return the best-of-N time for one re.search call and whether it matched"""
+    best = math.inf
+    matched = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matched = regex.search(text) is not None
+        best = min(best, time.perf_counter() - start)
+    return best, matched
+
+def search_pattern(pattern: str, flags: int, repeat: int, text: str) -> Tuple[float, bool]:
+    """Compile and time a pattern; module level so it can run in a worker process"""
+    return time_search(re.compile(pattern, flags), text, repeat=repeat)
+
+def classify_log(monitor, text: str) -> Tuple[float, str]:
+    """Time analyze_error on a log and return the error type it reports"""
+    start = time.perf_counter()
+    analysis = monitor.analyze_error(text, 'profile')
+    elapsed = time.perf_counter() - start
+    return elapsed, analysis['error_type'] if analysis else 'none'
+
+class ItemFailed:
+    """Placeholder result for an item that raised or whose worker died"""
+    def __init__(self, reason: str):
+        self.reason = reason
+
+def _worker(conn, func: Callable, items: List):
+    for item in items:
+        try:
+            conn.send(('ok', func(item)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+    conn.close()
+
+def run_in_worker(func: Callable, items: List, item_timeout: float, budget: float = math.inf) -> Tuple[List, bool]:
+    """Call func on each item in a separate process, so a runaway regex can be killed.
+
+    Stops early once the total wall time exceeds `budget`. Returns the results that
+    completed and whether the worker was killed because one item exceeded `item_timeout`.
+    An item that raised, or whose worker died, gets an ItemFailed result.
+    """
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_worker, args=(sender, func, items), daemon=True)
+    process.start()
+    sender.close()
+
+    results = []
+    timed_out = False
+    start = time.monotonic()
+    try:
+        while len(results) < len(items):
+            if time.monotonic() - start > budget:
+                break
+            if not receiver.poll(item_timeout):
+                timed_out = True
+                break
+            try:
+                status, result = receiver.recv()
+            except EOFError:
+                logger.error("Profiling worker exited unexpectedly")
+                results.append(ItemFailed("worker exited unexpectedly"))
+                break
+            results.append(result if status == 'ok' else ItemFailed(result))
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    return results, timed_out
+
+def fit_exponent(timings: List[Tuple[int, float]]) -> Tuple[float, float]:
+    """Least-squares slope of log(time) over log(size), and the smallest pairwise slope"""
+    xs = [math.log(size) for size, _ in timings]
+    ys = [math.log(max(elapsed, 1e-7)) for _, elapsed in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    slope = (
+        sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        / sum((x - mean_x) ** 2 for x in xs)
+    )
+    pairwise = min((ys[i + 1] - ys[i]) / (xs[i + 1] - xs[i]) for i in range(len(xs) - 1))
+    return slope, pairwise
+
+class PatternProfiler:
+    def __init__(self, monitor):
+        self.flags = actions_monitor.PATTERN_FLAGS
+        self.compiled = {}
+
+        for error_type, pattern_data in monitor.error_patterns.items():
+            for pattern in pattern_data.get('patterns', []):
+                try:
+                    self.compiled[(error_type, pattern)] = re.compile(pattern, self.flags)
+                except re.error as e:
+                    logger.error(f"Invalid pattern in {error_type}: {pattern!r} ({e})")
+
+        # Replay analyze_error with the same patterns that are profiled individually
+        self.monitor = copy.copy(monitor)
+        self.monitor.error_patterns = {
+            error_type: {
+                **pattern_data,
+                'patterns': [pattern for pattern in pattern_data.get('patterns', []) if (error_type, pattern) in self.compiled]
+            }
+            for error_type, pattern_data in monitor.error_patterns.items()
+        }
+
+    def load_corpus(self, paths: List[str]) -> List[Tuple[str, str]]:
+        """Collect (path, text) for every log file under the given files/directories"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    files.extend(os.path.join(root, name) for name in sorted(names))
+            elif os.path.isfile(path):
+                files.append(path)
+            else:
+                logger.warning(f"Corpus path not found: {path}")
+
+        corpus = []
+        for file_path in sorted(files):
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                corpus.append((file_path, f.read()))
+        return corpus
+
+    def profile_corpus(self, corpus: List[Tuple[str, str]]) -> Dict:
+        """Measure per-pattern match time and hits, and replay analyze_error on each log.
+
+        Each pattern runs in a worker process; a log that takes longer than
+        CORPUS_SEARCH_TIMEOUT is recorded as a timeout and the pattern moves on.
+        """
+        texts = [text for _, text in corpus]
+        pattern_stats = []
+
+        for (error_type, pattern) in self.compiled:
+            stat = {'error_type': error_type, 'pattern': pattern, 'time': 0.0, 'hits': 0, 'timeouts': 0, 'errors': 0, 'files': set()}
+            search = functools.partial(search_pattern, pattern, self.flags, 1)
+
+            done = 0
+            while done < len(texts):
+                timings, timed_out = run_in_worker(search, texts[done:], CORPUS_SEARCH_TIMEOUT)
+                for offset, timing in enumerate(timings):
+                    if isinstance(timing, ItemFailed):
+                        logger.error(f"Pattern {pattern!r} failed on {corpus[done + offset][0]}: {timing.reason}")
+                        stat['errors'] += 1
+                        continue
+                    elapsed, matched = timing
+                    stat['time'] += elapsed
+                    if matched:
+                        stat['hits'] += 1
+                        stat['files'].add(corpus[done + offset][0])
+                done += len(timings)
+
+                if timed_out:
+                    logger.warning(f"Pattern {pattern!r} timed out on {corpus[done][0]}")
+                    stat['time'] += CORPUS_SEARCH_TIMEOUT
+                    stat['timeouts'] += 1
+                    done += 1
+
+            pattern_stats.append(stat)
+
+        classified = {}
+        analyze_time = 0.0
+        classify = functools.partial(classify_log, self.monitor)
+        done = 0
+        while done < len(texts):
+            outcomes, timed_out = run_in_worker(classify, texts[done:], CORPUS_SEARCH_TIMEOUT)
+            if timed_out:
+                analyze_time += CORPUS_SEARCH_TIMEOUT
+                outcomes.append((0.0, 'timeout'))
+            for outcome in outcomes:
+                if isinstance(outcome, ItemFailed):
+                    logger.error(f"analyze_error failed: {outcome.reason}")
+                    outcome = (0.0, 'error')
+                elapsed, error_type = outcome
+                analyze_time += elapsed
+                classified[error_type] = classified.get(error_type, 0) + 1
+            done += len(outcomes)
+
+        return {
+            'patterns': pattern_stats,
+            'classified': classified,
+            'analyze_time': analyze_time
+        }
+
+    def overlap(self, pattern_stats: List[Dict]) -> List[Dict]:
+        """Report pairs of patterns that matched the same log files"""
+        pairs = []
+        for i, first in enumerate(pattern_stats):
+            for second in pattern_stats[i + 1:]:
+                shared = first['files'] & second['files']
+                if shared:
+                    pairs.append({
+                        'first': f"{first['error_type']}: {first['pattern']}",
+                        'second': f"{second['error_type']}: {second['pattern']}",
+                        'same_type': first['error_type'] == second['error_type'],
+                        'shared_files': len(shared)
+                    })
+        return sorted(pairs, key=lambda pair: -pair['shared_files'])
+
+    def adversarial_inputs(self, pattern: str, size: int, line_length: int = 0) -> List[str]:
+        """Build inputs that tend to trigger backtracking without matching.
+
+        By default each input is a single line; with line_length the same content is
+        broken into lines, which is what real job logs look like.
+        """
+        units = ['a', 'error ']
+        prefix = literal_prefix(pattern)
+        if prefix:
+            units.append(prefix + ' ')
+
+        inputs = []
+        for unit in units:
+            text = (unit * (size // len(unit) + 1))[:size]
+            if line_length:
+                text = '\n'.join(text[i:i + line_length - 1] for i in range(0, size, line_length - 1))[:size]
+            inputs.append(text)
+        return inputs
+
+    def measure_growth(self, pattern: str, variant: int, line_length: int = 0) -> Dict:
+        """Time one input shape at increasing sizes and classify how the cost grows"""
+        texts = [self.adversarial_inputs(pattern, size, line_length)[variant] for size in ADVERSARIAL_SIZES]
+        search = functools.partial(search_pattern, pattern, self.flags, 5)
+        timings, timed_out = run_in_worker(search, texts, PROBE_SEARCH_TIMEOUT, budget=PROBE_BUDGET)
+
+        points = []
+        for text, timing in zip(texts, timings):
+            if isinstance(timing, ItemFailed):
+                logger.error(f"Backtracking probe for {pattern!r} failed at {len(text)} characters: {timing.reason}")
+                break
+            points.append((len(text), timing[0]))
+        worst_time = max((elapsed for _, elapsed in points), default=0.0)
+
+        # Too slow to even reach a handful of small inputs. A timeout after that is
+        # just where the growth curve ran out of budget, so the fit below decides.
+        if len(points) < MIN_FIT_POINTS:
+            return {'severity': 'catastrophic', 'exponent': None, 'worst_time': worst_time, 'timed_out': timed_out}
+
+        exponent, pairwise = fit_exponent(points[-MIN_FIT_POINTS:])
+        if exponent > CATASTROPHIC_EXPONENT and pairwise > CONSISTENT_EXPONENT:
+            severity = 'catastrophic'
+        elif exponent > SUPERLINEAR_EXPONENT and pairwise > CONSISTENT_EXPONENT:
+            severity = 'superlinear'
+        else:
+            severity = 'linear'
+
+        return {'severity': severity, 'exponent': exponent, 'worst_time': worst_time, 'timed_out': timed_out}
+
+    def probe_backtracking(self, key: Tuple[str, str]) -> Dict:
+        """Estimate how match time grows with input size on adversarial inputs.
+
+        Super-linear growth that disappears once the input is split into ordinary
+        log lines (the usual `A.*B` case) is reported as 'line_bounded'.
+        """
+        pattern = key[1]
+        worst = {'severity': 'linear', 'exponent': 0.0, 'worst_time': 0.0, 'timed_out': False}
+
+        for variant in range(len(self.adversarial_inputs(pattern, 1))):
+            growth = self.measure_growth(pattern, variant)
+
+            if growth['severity'] == 'superlinear':
+                multiline = self.measure_growth(pattern, variant, line_length=LINE_LENGTH)
+                if multiline['severity'] == 'linear':
+                    growth['severity'] = 'line_bounded'
+
+            if SEVERITIES.index(growth['severity']) > SEVERITIES.index(worst['severity']):
+                worst = growth
+            elif growth['severity'] == worst['severity'] and (growth['exponent'] or 0) > (worst['exponent'] or 0):
+                worst = growth
+
+        return worst
+
+    def suggest_priority(self, pattern_stats: List[Dict], corpus_size: int) -> List[Dict]:
+        """Order error types and their patterns by hit probability per second of matching.
+
+        For a first-match scan this ratio puts cheap, frequent patterns first and
+        expensive, rare ones last.
+        """
+        by_type = {}
+        for stat in pattern_stats:
+            by_type.setdefault(stat['error_type'], []).append(stat)
+
+        def score(hits: int, cost: float) -> float:
+            return (hits / corpus_size if corpus_size else 0.0) / max(cost, 1e-9)
+
+        order = []
+        for error_type, stats in by_type.items():
+            patterns = sorted(stats, key=lambda stat: (-score(stat['hits'], stat['time']), stat['time']))
+            type_hits = len(set().union(*(stat['files'] for stat in stats)))
+            type_cost = sum(stat['time'] for stat in stats)
+            order.append({
+                'error_type': error_type,
+                'hits': type_hits,
+                'time': type_cost,
+                'score': score(type_hits, type_cost),
+                'patterns': [stat['pattern'] for stat in patterns]
+            })
+
+        return sorted(order, key=lambda entry: (-entry['score'], entry['time']))
+
+    def run(self, paths: List[str], check_backtracking: bool = True) -> Dict:
+        """Profile all patterns against the corpus and return the results"""
+        corpus = self.load_corpus(paths)
+        logger.info(f"Profiling {len(self.compiled)} patterns against {len(corpus)} log files")
+
+        profile = self.profile_corpus(corpus)
+        pattern_stats = profile['patterns']
+
+        if check_backtracking:
+            for stat in pattern_stats:
+                stat['backtracking'] = self.probe_backtracking((stat['error_type'], stat['pattern']))
+
+        results = {
+            'corpus_files': len(corpus),
+            'corpus_bytes': sum(len(text) for _, text in corpus),
+            'analyze_error_time': profile['analyze_time'],
+            'classified': profile['classified'],
+            'overlap': self.overlap(pattern_stats),
+            'priority': self.suggest_priority(pattern_stats, len(corpus)),
+            'patterns': []
+        }
+
+        for stat in sorted(pattern_stats, key=lambda stat: -stat['time']):
+            entry = {key: value for key, value in stat.items() if key != 'files'}
+            entry['hit_rate'] = stat['hits'] / len(corpus) if corpus else 0.0
+            results['patterns'].append(entry)
+
+        return results
+
+    def generate_report(self, results: Dict) -> str:
+        """Generate a human-readable report"""
+        report = []
+        report.append("# ⏱️ Error Pattern Profile")
+        report.append(f"**Corpus:** {results['corpus_files']} files, {results['corpus_bytes'] / 1024 / 1024:.1f} MB")
+        report.append(f"**analyze_error total:** {results['analyze_error_time'] * 1000:.1f} ms")
+        report.append("")
+
+        report.append("## 📊 Per-Pattern Cost")
+        report.append("| Error type | Pattern | Time (ms) | Hits | Hit rate | Backtracking |")
+        report.append("| --- | --- | ---: | ---: | ---: | --- |")
+        for entry in results['patterns']:
+            backtracking = entry.get('backtracking')
+            if backtracking is None:
+                growth = "-"
+            elif backtracking['severity'] == 'catastrophic':
+                growth = "🛑 catastrophic (timeout)" if backtracking['exponent'] is None else f"🛑 O(n^{backtracking['exponent']:.1f})"
+            elif backtracking['severity'] == 'superlinear':
+                growth = f"⚠️ O(n^{backtracking['exponent']:.1f})"
+            elif backtracking['severity'] == 'line_bounded':
+                growth = f"ℹ️ O(n^{backtracking['exponent']:.1f}) per line"
+            else:
+                growth = f"✅ O(n^{backtracking['exponent']:.1f})"
+            time_ms = f"{entry['time'] * 1000:.2f}"
+            if entry['timeouts']:
+                time_ms += f" (⏱️ {entry['timeouts']} timeouts)"
+            if entry['errors']:
+                time_ms += f" (❗ {entry['errors']} errors)"
+            report.append(
+                f"| {entry['error_type']} | `{entry['pattern']}` | {time_ms} "
+                f"| {entry['hits']} | {entry['hit_rate'] * 100:.1f}% | {growth} |"
+            )
+        report.append("")
+        report.append("✅ linear · ℹ️ super-linear within a single line only · ⚠️ super-linear across lines · 🛑 runaway backtracking or timeout")
+        report.append("")
+
+        report.append("## 🏷️ analyze_error Classification")
+        for error_type, count in sorted(results['classified'].items(), key=lambda item: -item[1]):
+            report.append(f"- **{error_type}:** {count}")
+        report.append("")
+
+        if results['overlap']:
+            report.append("## 🔀 Overlapping Patterns")
+            for pair in results['overlap']:
+                scope = "same type" if pair['same_type'] else "⚠️ different types"
+                report.append(f"- `{pair['first']}` ∩ `{pair['second']}`: {pair['shared_files']} files ({scope})")
+            report.append("")
+
+        report.append("## 🔢 Suggested Priority Order")
+        report.append("Cheap, frequent patterns first; expensive, rare patterns last.")
+        for i, entry in enumerate(results['priority'], 1):
+            report.append(f"{i}. **{entry['error_type']}** ({entry['hits']} hits, {entry['time'] * 1000:.2f} ms)")
+            for pattern in entry['patterns']:
+                report.append(f"    - `{pattern}`")
+
+        return "\n".join(report)
+
+def main():
+    """Main function to run the profiler"""
+    parser = argparse.ArgumentParser(description="Profile error-patterns.json against a corpus of saved job logs")
+    parser.add_argument('corpus', nargs='+', help="Log files or directories of log files")
+    parser.add_argument('--output', default='pattern-profile-results.json', help="Where to write JSON results")
+    parser.add_argument('--skip-backtracking', action='store_true', help="Skip the adversarial backtracking probe")
+    args = parser.parse_args()
+
+    monitor = actions_monitor.GitHubActionsMonitor(os.getenv('GITHUB_REPOSITORY', 'thubv/kilocode'), token='')
+
+    profiler = PatternProfiler(monitor)
+    results = profiler.run(args.corpus, check_backtracking=not args.skip_backtracking)
+
+    print(profiler.generate_report(results))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    logger.info(f"Profiling complete. Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()